@@ -18,21 +18,42 @@ Usage:
 Requires:
   pip install python-docx pypdf
   LibreOffice installed (soffice.exe)
+  Optional: LibreOffice's Python bindings (uno) -> one soffice reused for all attempts
 """
 
+from __future__ import annotations
+
 import re
 import sys
+import atexit
+import json
+import math
+import functools
+import io
+import multiprocessing
+import os
 import shutil
 import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
-
-from docx import Document
-from docx.shared import Pt, Inches
-from docx.oxml import OxmlElement
-from docx.oxml.ns import qn
-from docx.opc.constants import RELATIONSHIP_TYPE as RT
-from pypdf import PdfReader
+from typing import TYPE_CHECKING, Dict, Iterator, List, Tuple, Optional
+from xml.sax.saxutils import escape as xml_escape
+
+# python-docx and pypdf are imported where they're used: the parent process only
+# orchestrates, and pypdf is just the last-resort page counter.
+if TYPE_CHECKING:
+    from docx.shared import Pt, Inches
+
+from trim_ops import (
+    BOLD_RE,
+    TrimRule,
+    line_kind,
+    normalize_whitespace,
+    strip_md_bold,
+    trim_steps,
+)
 
 
 # ----------------------------
@@ -86,12 +107,6 @@ FMT_PRESETS = [
 # ----------------------------
 # Regex helpers
 # ----------------------------
-BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
-H2_RE = re.compile(r"^##\s+(.+)$")
-H3_RE = re.compile(r"^###\s+(.+)$")
-BULLET_RE = re.compile(r"^\s*-\s+(.+)$")
-HR_RE = re.compile(r"^\s*-{3,}\s*$")
-
 EMAIL_RE = re.compile(r"(?P<email>[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,})")
 PHONE_RE = re.compile(
     r"(?P<phone>(?:\+?1[\s\-\.]?)?(?:\(\d{3}\)|\d{3})[\s\-\.]?\d{3}[\s\-\.]?\d{4})"
@@ -99,10 +114,17 @@ PHONE_RE = re.compile(
 URL_RE = re.compile(
     r"(?P<url>(?:https?://)?(?:www\.)?[A-Za-z0-9.-]+\.[A-Za-z]{2,}(?:/[^\s|,)]+)?)"
 )
-
-
-def strip_md_bold(s: str) -> str:
-    return re.sub(r"\*\*(.+?)\*\*", r"\1", s).strip()
+# One pass for all link kinds; alternation order is the tie-break (email > phone > url)
+CONTACT_RE = re.compile("|".join(r.pattern for r in (EMAIL_RE, PHONE_RE, URL_RE)))
+# Cheap pre-check: bold needs "*", email "@", url ".xx", phone 3+ digits in a row
+MARKUP_HINT_RE = re.compile(r"[*@]|\.[A-Za-z]{2}|\d{3}")
+NON_DIGIT_RE = re.compile(r"\D")
+
+# PDF page counting without a full parse (innermost << >> dicts only)
+PDF_PAGES_DICT_RE = re.compile(
+    rb"<<(?=(?:(?!<<|>>).)*?/Type\s*/Pages\b)(?:(?!<<|>>).)*?/Count\s+(\d+)", re.S
+)
+PDF_PAGE_RE = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
 
 
 def normalize_url(url: str) -> str:
@@ -114,7 +136,7 @@ def normalize_url(url: str) -> str:
 
 def normalize_tel(phone: str) -> str:
     # Best effort E.164-ish for tel: links
-    digits = re.sub(r"\D", "", phone)
+    digits = NON_DIGIT_RE.sub("", phone)
     if len(digits) == 10:
         digits = "1" + digits
     if digits.startswith("1") and len(digits) == 11:
@@ -122,6 +144,7 @@ def normalize_tel(phone: str) -> str:
     return digits
 
 
+@functools.lru_cache(maxsize=1)
 def find_soffice() -> str:
     candidates = [
         r"C:\Program Files\LibreOffice\program\soffice.exe",
@@ -138,177 +161,222 @@ def find_soffice() -> str:
     raise RuntimeError("LibreOffice not found. Install LibreOffice or add soffice to PATH.")
 
 
-def pdf_pages(pdf_path: Path) -> int:
-    return len(PdfReader(str(pdf_path)).pages)
+def pdf_pages(pdf_path: Path, stop_at: Optional[int] = None) -> int:
+    """
+    Page count from a byte scan of the PDF: the page-tree root's /Count
+    (largest /Count on a /Type /Pages dict), else the number of /Type /Page
+    objects. Falls back to pypdf if the objects are compressed out of sight.
 
+    With stop_at, returns stop_at as soon as that many /Type /Page objects
+    have been seen (enough to know "more than one page").
+    """
+    data = pdf_path.read_bytes()
+    if stop_at is not None:
+        seen = 0
+        for _ in PDF_PAGE_RE.finditer(data):
+            seen += 1
+            if seen >= stop_at:
+                return seen
+    counts = [int(m.group(1)) for m in PDF_PAGES_DICT_RE.finditer(data)]
+    if counts:
+        return max(counts)
+    n = len(PDF_PAGE_RE.findall(data))
+    if n:
+        return n
+    from pypdf import PdfReader
+    return len(PdfReader(str(pdf_path)).pages)
 
-def md_read(md_path: Path) -> List[str]:
-    return md_path.read_text(encoding="utf-8").splitlines()
 
-
-def normalize_whitespace(lines: List[str]) -> List[str]:
-    cleaned: List[str] = []
-    blank = 0
-    for ln in lines:
-        ln = re.sub(r"\s{2,}$", "", ln.rstrip())  # remove forced MD linebreak spaces
-        if HR_RE.match(ln):
-            continue
-        if ln.strip() == "":
-            blank += 1
-            if blank <= 1:
-                cleaned.append("")
-        else:
-            blank = 0
-            cleaned.append(ln)
-    return cleaned
+def md_read(md_path: Path) -> Iterator[str]:
+    # splitlines(), not file iteration: it also breaks on \f, \v, \x1c-\x1e, \x85,
+    # \u2028 and \u2029, which must not reach the DOCX XML inside a line
+    yield from md_path.read_text(encoding="utf-8").splitlines()
 
 
 # ----------------------------
-# Trim logic
+# Page estimate (picks where the trim search starts)
 # ----------------------------
-def drop_section(lines: List[str], section_title: str) -> List[str]:
-    out: List[str] = []
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        m3 = H3_RE.match(line)
-        if m3 and strip_md_bold(m3.group(1)) == section_title:
-            i += 1
-            while i < len(lines) and not H3_RE.match(lines[i]) and not H2_RE.match(lines[i]):
-                i += 1
-            continue
-        out.append(line)
-        i += 1
-    return out
-
-
-def keep_only_projects(lines: List[str], keep_n: int) -> List[str]:
-    out: List[str] = []
-    i = 0
-    in_projects = False
-    project_count = 0
-    skipping = False
-
-    while i < len(lines):
-        line = lines[i]
-        if H2_RE.match(line) and "TECHNICAL PROJECT" in line.upper():
-            in_projects = True
-            skipping = False
-            out.append(line)
-            i += 1
-            continue
+PAGE_W_IN = 8.5
+PAGE_H_IN = 11.0
+LINE_SPACING = 1.22          # Calibri single spacing, in multiples of font size
+DEFAULT_CHAR_EM = 0.50       # average Calibri glyph width, in ems
+ESTIMATE_MAX = 1.10          # estimate above this = "won't fit" when picking the first probe
+CHAR_WIDTH_CACHE = Path.home() / ".cache" / "resume_pipeline" / "char_width.json"
 
-        if in_projects and H2_RE.match(line):
-            in_projects = False
-            skipping = False
-            out.append(line)
-            i += 1
-            continue
 
-        if in_projects and H3_RE.match(line):
-            project_count += 1
-            skipping = project_count > keep_n
-            if not skipping:
-                out.append(line)
-            i += 1
-            continue
+def char_width_key(fmt: dict) -> str:
+    return f"Calibri@{fmt['body_pt']}"
 
-        if in_projects and skipping:
-            i += 1
-            continue
 
-        out.append(line)
-        i += 1
+def load_char_widths() -> dict:
+    try:
+        return json.loads(CHAR_WIDTH_CACHE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
 
-    return out
 
+def save_char_widths(widths: dict):
+    try:
+        CHAR_WIDTH_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        CHAR_WIDTH_CACHE.write_text(json.dumps(widths, indent=2, sort_keys=True), encoding="utf-8")
+    except OSError:
+        pass  # cache is an optimization only
 
-def trim_bullets_under(lines: List[str], header_title: str, keep_k: int) -> List[str]:
-    out: List[str] = []
-    i = 0
-    in_target = False
-    kept = 0
 
-    while i < len(lines):
-        line = lines[i]
-        if H3_RE.match(line):
-            title = strip_md_bold(H3_RE.match(line).group(1))
-            in_target = (title == header_title)
-            kept = 0
-            out.append(line)
-            i += 1
-            continue
+def calibrate_char_width(widths: dict, key: str, estimate: float, pages: int):
+    """
+    Nudge the cached glyph width toward whatever the real render said.
+    """
+    em = widths.get(key, DEFAULT_CHAR_EM)
+    if pages > 1 and estimate <= 1.0:
+        em *= 1.05
+    elif pages == 1 and estimate > 1.0:
+        em *= 0.95
+    widths[key] = round(em, 4)
 
-        if in_target:
-            bm = BULLET_RE.match(line)
-            if bm:
-                kept += 1
-                if kept <= keep_k:
-                    out.append(line)
-                i += 1
-                continue
-            out.append(line)
-            i += 1
-            continue
 
-        out.append(line)
-        i += 1
+def estimate_pages(lines: List[str], fmt: dict, char_em: float = DEFAULT_CHAR_EM) -> float:
+    """
+    Rough page count from the Markdown alone: wrapped line count x line height
+    plus paragraph spacing, over the usable page height.
+    """
+    usable_w = (PAGE_W_IN - 2 * fmt["margin"]) * 72
+    usable_h = (PAGE_H_IN - 2 * fmt["margin"]) * 72
+    bullet_w = usable_w - fmt["bullet_left"] * 72
+
+    height = 0.0
+    for line in lines:
+        kind = line_kind(line)
+        if kind == "hr" or not line.strip():
+            continue
 
-    return out
+        width = usable_w
+        before = 0.0
+        if kind == "h1":
+            text, size, after = line[2:], fmt["name_pt"], 1
+        elif kind == "h2":
+            text, size, after = line[3:], fmt["h2_pt"], fmt["h2_after"]
+            before = fmt["h2_before"]
+        elif kind == "h3":
+            text, size, after = line[4:], fmt["h3_pt"], fmt["h3_after"]
+            before = fmt["h3_before"]
+        elif kind == "bullet":
+            text, size, after = line[2:], fmt["body_pt"], fmt["bullet_after"]
+            width = bullet_w
+        else:
+            text, size, after = line, fmt["body_pt"], fmt["para_after"]
 
+        chars = len(strip_md_bold(text))
+        wrapped = max(1, math.ceil(chars * char_em * size / width))
+        height += wrapped * size * LINE_SPACING + before + after
 
-def apply_trim_rule(lines: List[str], rule: Tuple) -> List[str]:
-    kind = rule[0]
-    if kind == "DROP_SECTION":
-        return drop_section(lines, rule[1])
-    if kind == "KEEP_ONLY_PROJECTS":
-        return keep_only_projects(lines, rule[1])
-    if kind == "TRIM_BULLETS_UNDER":
-        title, keep_k = rule[1]
-        return trim_bullets_under(lines, title, keep_k)
-    return lines
+    return height / usable_h
 
 
 # ----------------------------
-# Word hyperlink helpers
+# Paragraph XML (md_to_docx builds the body as text and parses it once)
 # ----------------------------
-def add_hyperlink(paragraph, url: str, text: str, *, bold: bool = False, font_size: Optional[Pt] = None):
-    part = paragraph.part
-    r_id = part.relate_to(url, RT.HYPERLINK, is_external=True)
-
-    hyperlink = OxmlElement("w:hyperlink")
-    hyperlink.set(qn("r:id"), r_id)
-
-    new_run = OxmlElement("w:r")
-    rPr = OxmlElement("w:rPr")
-
-    if bold:
-        rPr.append(OxmlElement("w:b"))
-
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+HYPERLINK_TMPL = '<w:hyperlink r:id="{rid}"><w:r>{rpr}<w:t>{text}</w:t></w:r></w:hyperlink>'
+
+
+def t_xml(text: str) -> str:
+    # Same as python-docx's run.text: tabs become <w:tab/>, edge spaces preserved
+    out = []
+    for i, piece in enumerate(text.split("\t")):
+        if i:
+            out.append("<w:tab/>")
+        if piece:
+            space = ' xml:space="preserve"' if piece.strip() != piece else ""
+            out.append(f"<w:t{space}>{xml_escape(piece)}</w:t>")
+    return "".join(out)
+
+
+def rpr_xml(*, bold: Optional[bool] = None, font_size: Optional[Pt] = None, underline: bool = False) -> str:
+    rpr = ""
+    if bold is not None:
+        rpr += "<w:b/>" if bold else '<w:b w:val="0"/>'
     if font_size is not None:
-        sz = OxmlElement("w:sz")
-        sz.set(qn("w:val"), str(int(font_size.pt * 2)))
-        rPr.append(sz)
+        rpr += f'<w:sz w:val="{int(font_size.pt * 2)}"/>'
+    if underline:
+        rpr += '<w:u w:val="single"/>'
+    return f"<w:rPr>{rpr}</w:rPr>" if rpr else ""
 
-    u = OxmlElement("w:u")
-    u.set(qn("w:val"), "single")
-    rPr.append(u)
 
-    new_run.append(rPr)
+class ParagraphXml:
+    """
+    One <w:p> collected as XML text. Set the paragraph-format attributes at
+    any point; xml() orders pPr children the way Word's schema wants them.
+    """
 
-    t = OxmlElement("w:t")
-    t.text = text
-    new_run.append(t)
+    def __init__(self, part, style_id: Optional[str] = None):
+        self.part = part
+        self.style_id = style_id
+        self.space_before: Optional[Pt] = None
+        self.space_after: Optional[Pt] = None
+        self.left_indent: Optional[Inches] = None
+        self.hanging: Optional[Inches] = None
+        self.runs: List[str] = []
+
+    def add_run(self, text: str, *, bold: Optional[bool] = None, font_size: Optional[Pt] = None):
+        self.runs.append(f"<w:r>{rpr_xml(bold=bold, font_size=font_size)}{t_xml(text)}</w:r>")
+
+    def xml(self) -> str:
+        ppr = ""
+        if self.style_id:
+            ppr += f'<w:pStyle w:val="{self.style_id}"/>'
+        spacing = ""
+        if self.space_before is not None:
+            spacing += f' w:before="{self.space_before.twips}"'
+        if self.space_after is not None:
+            spacing += f' w:after="{self.space_after.twips}"'
+        if spacing:
+            ppr += f"<w:spacing{spacing}/>"
+        ind = ""
+        if self.left_indent is not None:
+            ind += f' w:left="{self.left_indent.twips}"'
+        if self.hanging is not None:
+            ind += f' w:hanging="{self.hanging.twips}"'
+        if ind:
+            ppr += f"<w:ind{ind}/>"
+        ppr = f"<w:pPr>{ppr}</w:pPr>" if ppr else ""
+        return f"<w:p>{ppr}{''.join(self.runs)}</w:p>"
 
-    hyperlink.append(new_run)
-    paragraph._p.append(hyperlink)
 
+# ----------------------------
+# Word hyperlink helpers
+# ----------------------------
+def add_hyperlink(paragraph: ParagraphXml, url: str, text: str, *, bold: bool = False,
+                  font_size: Optional[Pt] = None):
+    # relate_to() already reuses an existing rel, but finds it by scanning every rel
+    # on the part; the contact URLs repeat, so remember their rIds per part.
+    part = paragraph.part
+    rid_cache = part.__dict__.setdefault("_rid_cache", {})
+    r_id = rid_cache.get(url)
+    if r_id is None:
+        from docx.opc.constants import RELATIONSHIP_TYPE as RT
+        r_id = rid_cache[url] = part.relate_to(url, RT.HYPERLINK, is_external=True)
+    rpr = rpr_xml(bold=True if bold else None, font_size=font_size, underline=True)
+    paragraph.runs.append(HYPERLINK_TMPL.format(rid=r_id, rpr=rpr, text=xml_escape(text)))
 
-def add_runs_with_bold(p, text: str, *, force_bold: bool = False, font_size: Optional[Pt] = None):
+
+def add_runs_with_bold(p: ParagraphXml, text: str, *, force_bold: bool = False,
+                       font_size: Optional[Pt] = None):
     """
     Adds text supporting **bold** and hyperlinks (email/phone/url).
     Email > phone > url precedence for overlapping matches.
     """
+    def add_plain(s: str, is_bold: bool):
+        if not s:
+            return
+        p.add_run(s, bold=force_bold or is_bold, font_size=font_size)
+
+    # Plain prose (most bullets) has nothing to split or link
+    if not MARKUP_HINT_RE.search(text):
+        add_plain(text, False)
+        return
+
     # Split by **bold**
     segments = []
     last = 0
@@ -320,38 +388,17 @@ def add_runs_with_bold(p, text: str, *, force_bold: bool = False, font_size: Opt
     if last < len(text):
         segments.append((False, text[last:]))
 
-    def add_plain(s: str, is_bold: bool):
-        if not s:
-            return
-        run = p.add_run(s)
-        run.bold = force_bold or is_bold
-        if font_size is not None:
-            run.font.size = font_size
-
     for is_bold_seg, seg in segments:
-        seg = seg or ""
-        i = 0
-        while i < len(seg):
-            em = EMAIL_RE.search(seg, i)
-            pm = PHONE_RE.search(seg, i)
-            um = URL_RE.search(seg, i)
-
-            # Choose earliest; tie-break: email > phone > url
-            candidates = []
-            if em: candidates.append(("email", em.start(), em))
-            if pm: candidates.append(("phone", pm.start(), pm))
-            if um: candidates.append(("url", um.start(), um))
-            if not candidates:
-                add_plain(seg[i:], is_bold_seg)
-                break
-
-            candidates.sort(key=lambda x: (x[1], {"email": 0, "phone": 1, "url": 2}[x[0]]))
-            kind, start, m = candidates[0]
-
-            if start > i:
-                add_plain(seg[i:start], is_bold_seg)
+        # Same cheap check per segment: e.g. "**ServiceNow**" needs no link scan
+        if not MARKUP_HINT_RE.search(seg):
+            add_plain(seg, is_bold_seg)
+            continue
+        last = 0
+        for m in CONTACT_RE.finditer(seg):
+            if m.start() > last:
+                add_plain(seg[last:m.start()], is_bold_seg)
 
-            token = m.group(0)
+            kind = m.lastgroup
             bold = force_bold or is_bold_seg
 
             if kind == "email":
@@ -369,7 +416,9 @@ def add_runs_with_bold(p, text: str, *, force_bold: bool = False, font_size: Opt
                 else:
                     add_hyperlink(p, normalize_url(raw_url), raw_url, bold=bold, font_size=font_size)
 
-            i = m.end()
+            last = m.end()
+        if last < len(seg):
+            add_plain(seg[last:], is_bold_seg)
 
 
 # ----------------------------
@@ -396,8 +445,22 @@ def normalize_contact_lines(lines: List[str]) -> List[str]:
 # ----------------------------
 # DOCX creation
 # ----------------------------
+@functools.lru_cache(maxsize=1)
+def blank_docx_bytes() -> bytes:
+    # A blank Document() saved once per process; attempts reopen it from memory
+    from docx import Document
+    buf = io.BytesIO()
+    Document().save(buf)
+    return buf.getvalue()
+
+
 def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
-    doc = Document()
+    from docx import Document
+    from docx.oxml import parse_xml
+    from docx.oxml.ns import qn
+    from docx.shared import Pt, Inches
+
+    doc = Document(io.BytesIO(blank_docx_bytes()))
     sec = doc.sections[0]
     sec.top_margin = Inches(fmt["margin"])
     sec.bottom_margin = Inches(fmt["margin"])
@@ -412,6 +475,24 @@ def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
     bullet_left = Inches(fmt["bullet_left"])
     bullet_hang = Inches(fmt["bullet_hang"])
 
+    # Precompute every size/spacing once instead of per paragraph
+    pt_0, pt_1, pt_2 = Pt(0), Pt(1), Pt(2)
+    pt_name = Pt(fmt["name_pt"])
+    pt_h2, pt_h2_before, pt_h2_after = Pt(fmt["h2_pt"]), Pt(fmt["h2_before"]), Pt(fmt["h2_after"])
+    pt_h3, pt_h3_before, pt_h3_after = Pt(fmt["h3_pt"]), Pt(fmt["h3_before"]), Pt(fmt["h3_after"])
+    pt_para_after = Pt(fmt["para_after"])
+    pt_bullet_after = Pt(fmt["bullet_after"])
+    bullet_style = doc.styles["List Bullet"].style_id
+
+    # Paragraphs are collected as XML text and parsed into the body once at the end
+    part = doc.part
+    paras: List[ParagraphXml] = []
+
+    def add_paragraph(style_id: Optional[str] = None) -> ParagraphXml:
+        p = ParagraphXml(part, style_id)
+        paras.append(p)
+        return p
+
     # Contact normalization state:
     in_header_block = False
     header_lines: List[str] = []
@@ -426,45 +507,43 @@ def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
         # - contact line becomes Email | Phone | LinkedIn | GitHub (clickable)
         # We’ll parse tokens across header_lines.
         text = " ".join(header_lines)
-        # Extract
-        email = EMAIL_RE.search(text)
-        phone = PHONE_RE.search(text)
-        urls = URL_RE.findall(text)
-
-        # Identify LinkedIn/GitHub (best effort)
-        linkedin = None
-        github = None
-        other_urls = []
-
-        for u in urls:
-            u_norm = u.lower()
-            if "linkedin.com" in u_norm and linkedin is None:
-                linkedin = u
-            elif "github.com" in u_norm and github is None:
-                github = u
+        # Extract in one scan: first email, first phone, LinkedIn/GitHub (best effort)
+        email = phone = linkedin = github = None
+        for m in CONTACT_RE.finditer(text):
+            kind, val = m.lastgroup, m.group(0)
+            if kind == "email":
+                if email is None:
+                    email = val
+            elif kind == "phone":
+                if phone is None:
+                    phone = val
             else:
-                other_urls.append(u)
+                u_norm = val.lower()
+                if "linkedin.com" in u_norm and linkedin is None:
+                    linkedin = val
+                elif "github.com" in u_norm and github is None:
+                    github = val
 
         # First line: try to keep a location line if present
         # (heuristic: first header line often is "Omaha, NE")
         # We'll just print the first header line that doesn't contain email/phone/url.
         location_line = None
         for hl in header_lines:
-            if (EMAIL_RE.search(hl) is None) and (PHONE_RE.search(hl) is None) and (URL_RE.search(hl) is None):
+            if CONTACT_RE.search(hl) is None:
                 location_line = hl.strip()
                 break
 
         if location_line:
-            p = doc.add_paragraph()
+            p = add_paragraph()
             add_runs_with_bold(p, location_line, force_bold=False)
-            p.paragraph_format.space_after = Pt(0)
+            p.space_after = pt_0
 
         # Contact line: Email | Phone | LinkedIn | GitHub
         parts = []
         if email:
-            parts.append(("email", email.group("email")))
+            parts.append(("email", email))
         if phone:
-            parts.append(("phone", phone.group("phone")))
+            parts.append(("phone", phone))
         if linkedin:
             parts.append(("url", linkedin))
         if github:
@@ -473,17 +552,16 @@ def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
         # If nothing extracted, just output original lines
         if not parts:
             for hl in header_lines:
-                p = doc.add_paragraph()
+                p = add_paragraph()
                 add_runs_with_bold(p, hl.strip(), force_bold=False)
-                p.paragraph_format.space_after = Pt(0)
+                p.space_after = pt_0
         else:
-            p = doc.add_paragraph()
+            p = add_paragraph()
             # Build clickable chunks with separators
             first = True
             for kind, val in parts:
                 if not first:
-                    run = p.add_run(" | ")
-                    run.bold = False
+                    p.add_run(" | ", bold=False)
                 first = False
 
                 if kind == "email":
@@ -494,32 +572,63 @@ def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
                     label = "LinkedIn" if linkedin and val == linkedin else ("GitHub" if github and val == github else val)
                     add_hyperlink(p, normalize_url(val), label, bold=False, font_size=None)
 
-            p.paragraph_format.space_after = Pt(2)
+            p.space_after = pt_2
 
         header_lines = []
         in_header_block = False
 
-    for i, line in enumerate(lines):
+    # Body line handlers, dispatched on line_kind()
+    def add_h2(line: str):
+        p = add_paragraph()
+        p.add_run(line[3:].strip(), bold=True, font_size=pt_h2)
+        p.space_before = pt_h2_before
+        p.space_after = pt_h2_after
+
+    def add_h3(line: str):
+        # Subheaders (roles/projects) - bold always
+        p = add_paragraph()
+        title = line[4:].strip()
+        add_runs_with_bold(p, title, force_bold=True, font_size=pt_h3)
+        p.space_before = pt_h3_before
+        p.space_after = pt_h3_after
+
+    def add_bullet(line: str):
+        # Bullets with hanging indent
+        p = add_paragraph(bullet_style)
+        add_runs_with_bold(p, line[2:].strip(), force_bold=False, font_size=None)
+        p.left_indent = bullet_left
+        p.hanging = bullet_hang
+        p.space_after = pt_bullet_after
+
+    def add_para(line: str):
+        # Normal paragraphs (links enabled)
+        p = add_paragraph()
+        add_runs_with_bold(p, line.strip(), force_bold=False, font_size=None)
+        p.space_after = pt_para_after
+
+    handlers = {"h2": add_h2, "h3": add_h3, "bullet": add_bullet, "para": add_para}
+
+    for line in lines:
         line = line.rstrip()
         if not line.strip():
             # if we're in header block, stop it on blank line
             if in_header_block:
                 flush_header_block()
             continue
-        if HR_RE.match(line):
+
+        kind = line_kind(line)
+        if kind == "hr":
             continue
 
         # Name line starts header parsing
-        if line.startswith("# "):
+        if kind == "h1":
             # flush any previous header (shouldn’t happen)
             if in_header_block:
                 flush_header_block()
 
-            p = doc.add_paragraph()
-            r = p.add_run(line[2:].strip())
-            r.bold = True
-            r.font.size = Pt(fmt["name_pt"])
-            p.paragraph_format.space_after = Pt(1)
+            p = add_paragraph()
+            p.add_run(line[2:].strip(), bold=True, font_size=pt_name)
+            p.space_after = pt_1
 
             in_header_block = True
             header_lines = []
@@ -527,55 +636,163 @@ def md_to_docx(lines: List[str], docx_path: Path, fmt: dict):
 
         # Capture header block lines until first ## section
         if in_header_block:
-            if line.startswith("## "):
+            if kind == "h2":
                 flush_header_block()
                 # fall through to section rendering
             else:
                 header_lines.append(line.strip())
                 continue
 
-        # Sections
-        if line.startswith("## "):
-            p = doc.add_paragraph()
-            r = p.add_run(line[3:].strip())
-            r.bold = True
-            r.font.size = Pt(fmt["h2_pt"])
-            p.paragraph_format.space_before = Pt(fmt["h2_before"])
-            p.paragraph_format.space_after = Pt(fmt["h2_after"])
-            continue
-
-        # Subheaders (roles/projects) - bold always
-        if line.startswith("### "):
-            p = doc.add_paragraph()
-            title = line[4:].strip()
-            add_runs_with_bold(p, title, force_bold=True, font_size=Pt(fmt["h3_pt"]))
-            p.paragraph_format.space_before = Pt(fmt["h3_before"])
-            p.paragraph_format.space_after = Pt(fmt["h3_after"])
-            continue
-
-        # Bullets with hanging indent
-        if line.startswith("- "):
-            p = doc.add_paragraph(style="List Bullet")
-            add_runs_with_bold(p, line[2:].strip(), force_bold=False, font_size=None)
-            pf = p.paragraph_format
-            pf.left_indent = bullet_left
-            pf.first_line_indent = -bullet_hang
-            pf.space_after = Pt(fmt["bullet_after"])
-            continue
-
-        # Normal paragraphs (links enabled)
-        p = doc.add_paragraph()
-        add_runs_with_bold(p, line.strip(), force_bold=False, font_size=None)
-        p.paragraph_format.space_after = Pt(fmt["para_after"])
+        handlers[kind](line)
 
     # flush header if file ends before a section
     if in_header_block:
         flush_header_block()
 
+    body = doc.element.body
+    fragment = parse_xml(
+        f'<w:body xmlns:w="{W_NS}" xmlns:r="{R_NS}">{"".join(p.xml() for p in paras)}</w:body>'
+    )
+    sect_pr = body.find(qn("w:sectPr"))
+    for el in list(fragment):
+        if sect_pr is not None:
+            sect_pr.addprevious(el)
+        else:
+            body.append(el)
+
     doc.save(str(docx_path))
 
 
-def docx_to_pdf(docx_path: Path, pdf_path: Path):
+# ----------------------------
+# LibreOffice conversion
+# ----------------------------
+class OfficeSession:
+    """
+    One headless soffice kept alive for the whole run, driven over UNO.
+    Avoids paying LibreOffice startup for every attempt.
+
+    Needs the LibreOffice Python bindings (`import uno`). If they are not
+    importable, convert() falls back to a one-shot `soffice --convert-to`.
+    Either way the session owns a private profile and listens on its own
+    named pipe, so several sessions can convert side by side and never reach
+    (or shut down) a LibreOffice someone else started.
+    """
+
+    def __init__(self, name: str = "main"):
+        self.pipe = f"resume_build_{os.getpid()}_{name}"
+        self.proc: Optional[subprocess.Popen] = None
+        self.profile_dir: Optional[Path] = None
+        self.desktop = None
+
+    def __enter__(self) -> "OfficeSession":
+        # Private profile so we never collide with a user's open LibreOffice
+        self.profile_dir = Path(tempfile.mkdtemp(prefix="lo_profile_"))
+        try:
+            import uno  # noqa: F401  (ships with LibreOffice, not on PyPI)
+        except ImportError:
+            return self
+
+        accept = f"pipe,name={self.pipe};urp;StarOffice.ComponentContext"
+        self.proc = subprocess.Popen(
+            [
+                find_soffice(),
+                "--headless",
+                "--invisible",
+                "--nologo",
+                "--nofirststartwizard",
+                "--norestore",
+                f"-env:UserInstallation={self.profile_dir.as_uri()}",
+                f"--accept={accept}",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        # __exit__ never runs if we're interrupted before the with-body starts, and
+        # atexit doesn't run in pool workers (they leave via os._exit): clean up here
+        atexit.register(self.close)
+        try:
+            self.desktop = self._connect()
+        except BaseException:
+            self.close()
+            raise
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self, timeout: float = 30.0):
+        import uno
+        from com.sun.star.connection import NoConnectException
+
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local
+        )
+        url = f"uno:pipe,name={self.pipe};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                ctx = resolver.resolve(url)
+                break
+            except NoConnectException:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("LibreOffice listener did not come up.")
+                time.sleep(0.25)
+        return ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+    def convert(self, docx_path: Path, pdf_path: Path):
+        if self.desktop is None:
+            convert_once(docx_path, pdf_path, self.profile_dir)
+            return
+
+        import uno
+        from com.sun.star.beans import PropertyValue
+
+        def prop(name, value):
+            pv = PropertyValue()
+            pv.Name = name
+            pv.Value = value
+            return pv
+
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        doc = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(str(docx_path)), "_blank", 0, (prop("Hidden", True),)
+        )
+        if doc is None:
+            raise RuntimeError(f"LibreOffice could not open {docx_path}")
+        try:
+            doc.storeToURL(
+                uno.systemPathToFileUrl(str(pdf_path)),
+                (prop("FilterName", "writer_pdf_Export"),),
+            )
+        finally:
+            doc.close(True)
+
+    def close(self):
+        # Only ever stop the soffice this session spawned
+        told_to_exit = False
+        if self.desktop is not None and self.proc is not None:
+            try:
+                self.desktop.terminate()
+                told_to_exit = True
+            except Exception:
+                pass  # bridge already gone; the kill below still applies
+        self.desktop = None
+        if self.proc is not None:
+            try:
+                # Nothing asked it to exit (no bridge yet, or it broke): don't wait
+                self.proc.wait(timeout=10 if told_to_exit else 0)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+            self.proc = None
+        if self.profile_dir is not None:
+            shutil.rmtree(self.profile_dir, ignore_errors=True)
+            self.profile_dir = None
+        atexit.unregister(self.close)
+
+
+def convert_once(docx_path: Path, pdf_path: Path, profile_dir: Optional[Path] = None):
     soffice = find_soffice()
     outdir = pdf_path.parent
     outdir.mkdir(parents=True, exist_ok=True)
@@ -589,6 +806,8 @@ def docx_to_pdf(docx_path: Path, pdf_path: Path):
         "--outdir", str(outdir),
         str(docx_path),
     ]
+    if profile_dir is not None:
+        cmd.insert(1, f"-env:UserInstallation={profile_dir.as_uri()}")
     subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
     generated = outdir / (docx_path.stem + ".pdf")
@@ -598,6 +817,124 @@ def docx_to_pdf(docx_path: Path, pdf_path: Path):
         generated.replace(pdf_path)
 
 
+def docx_to_pdf(docx_path: Path, pdf_path: Path, office: Optional[OfficeSession] = None):
+    if office is None:
+        convert_once(docx_path, pdf_path)
+    else:
+        office.convert(docx_path, pdf_path)
+
+
+def scratch_dir() -> tempfile.TemporaryDirectory:
+    # Per-attempt files live in RAM where we can (Linux /dev/shm)
+    shm = Path("/dev/shm")
+    base = str(shm) if shm.is_dir() and os.access(shm, os.W_OK) else None
+    return tempfile.TemporaryDirectory(prefix="resume_build_", dir=base)
+
+
+def publish(src: Path, dst: Path):
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    shutil.copyfile(src, dst)
+
+
+def find_min_trim_prefix(n_steps: int, first_probe: int, fits_at) -> Optional[int]:
+    """
+    Smallest step k for which fits_at(k) is True, assuming trimming more never
+    makes the resume longer. Binary search, starting at first_probe; fits_at
+    returns None to abort. Returns None if no step fits (or on abort).
+    """
+    lo, hi = 0, n_steps - 1  # the answer, if any, is in [lo, hi]
+    probe = first_probe
+    while lo < hi:
+        fits = fits_at(probe)
+        if fits is None:
+            return None
+        if fits:
+            hi = probe
+        else:
+            lo = probe + 1
+        probe = (lo + hi) // 2
+    if lo > hi:
+        return None  # even the last step didn't fit
+    return lo if fits_at(lo) else None
+
+
+def run_preset(steps: List[Tuple[Optional[TrimRule], List[str]]], fmt: dict,
+               docx_path: Path, pdf_path: Path, office: OfficeSession, char_widths: dict,
+               stop=None) -> Tuple[bool, Optional[Tuple], int]:
+    """
+    Find the fewest trim steps (see trim_steps) that give a 1-page PDF for
+    this preset, and leave that render at docx_path/pdf_path (or the fully
+    trimmed render if none fits). Returns (fits, last rule applied or None,
+    attempts). Gives up early once `stop` (an Event) is set.
+    """
+    key = char_width_key(fmt)
+    pages_at: Dict[int, int] = {}
+    # A rule that dropped nothing shares the previous step's list: render it once
+    same_as: List[int] = []
+    for k, (_, cur) in enumerate(steps):
+        same_as.append(same_as[k - 1] if k and cur is steps[k - 1][1] else k)
+
+    def step_paths(k: int) -> Tuple[Path, Path]:
+        return (docx_path.with_name(f"{docx_path.stem}.step{k}{docx_path.suffix}"),
+                pdf_path.with_name(f"{pdf_path.stem}.step{k}{pdf_path.suffix}"))
+
+    def fits_at(k: int) -> Optional[bool]:
+        k = same_as[k]
+        if k not in pages_at:
+            if stop is not None and stop.is_set():
+                return None
+            cur = steps[k][1]
+            step_docx, step_pdf = step_paths(k)
+            est = estimate_pages(cur, fmt, char_widths.get(key, DEFAULT_CHAR_EM))
+            md_to_docx(cur, step_docx, fmt)
+            docx_to_pdf(step_docx, step_pdf, office)
+            pages_at[k] = pdf_pages(step_pdf, stop_at=2)  # only "1 page or not" matters
+            calibrate_char_width(char_widths, key, est, pages_at[k])
+        return pages_at[k] == 1
+
+    # Start where the estimate first expects a fit; renders decide the rest
+    char_em = char_widths.get(key, DEFAULT_CHAR_EM)
+    last = len(steps) - 1
+    first_probe = next(
+        (k for k, (_, cur) in enumerate(steps) if estimate_pages(cur, fmt, char_em) <= ESTIMATE_MAX),
+        last,
+    )
+
+    best = find_min_trim_prefix(len(steps), first_probe, fits_at)
+    fits = best is not None
+    if best is None:
+        # Nothing fits: the fully trimmed render is the output
+        if fits_at(last) is None:
+            return False, None, len(pages_at)
+        best = last
+
+    step_docx, step_pdf = step_paths(same_as[best])
+    shutil.copyfile(step_docx, docx_path)
+    shutil.copyfile(step_pdf, pdf_path)
+    return fits, steps[best][0], len(pages_at)
+
+
+# Set in each preset worker process by _init_worker
+_STOP_EVENT = None
+
+
+def _init_worker(stop):
+    global _STOP_EVENT
+    _STOP_EVENT = stop
+
+
+def _preset_worker(idx: int, steps: List[Tuple[Optional[TrimRule], List[str]]], work_dir: str,
+                   char_widths: dict) -> Tuple[bool, Optional[Tuple], int, dict]:
+    work = Path(work_dir)
+    work.mkdir(parents=True, exist_ok=True)
+    with OfficeSession(name=f"preset{idx}") as office:
+        fits, rule, n = run_preset(
+            steps, FMT_PRESETS[idx], work / "attempt.docx", work / "attempt.pdf",
+            office, char_widths, _STOP_EVENT,
+        )
+    return fits, rule, n, char_widths
+
+
 def main():
     if len(sys.argv) != 4:
         print("Usage: python build_resume_onepage.py resume.md out.docx out.pdf")
@@ -611,34 +948,52 @@ def main():
         print(f"Markdown not found: {md_path}")
         sys.exit(1)
 
-    base_lines = normalize_whitespace(md_read(md_path))
-    attempts = 0
-
-    for fmt in FMT_PRESETS:
-        cur = list(base_lines)
-
-        # Try without trimming first
-        md_to_docx(cur, docx_path, fmt)
-        docx_to_pdf(docx_path, pdf_path)
-        pages = pdf_pages(pdf_path)
-        attempts += 1
-
-        if pages == 1:
+    base_lines = list(normalize_whitespace(md_read(md_path)))
+    # Trimming doesn't depend on the preset: compute every step once, share it
+    steps = trim_steps(base_lines, TRIM_RULES)
+    char_widths = load_char_widths()
+
+    try:
+        with scratch_dir() as tmp:
+            # Presets race in separate processes (each with its own soffice), but
+            # the earliest preset that fits still wins, as in the sequential loop.
+            stop = multiprocessing.Event()
+            with ProcessPoolExecutor(
+                max_workers=len(FMT_PRESETS), initializer=_init_worker, initargs=(stop,)
+            ) as pool:
+                futures = [
+                    pool.submit(_preset_worker, i, steps, str(Path(tmp) / f"preset{i}"), dict(char_widths))
+                    for i in range(len(FMT_PRESETS))
+                ]
+                try:
+                    for fut in futures:
+                        if fut.result()[0]:
+                            break
+                finally:
+                    # A fit (or an error) ends the race: later presets can stop
+                    stop.set()
+
+            results = [fut.result() for fut in futures]
+            for i, (_, _, _, widths) in enumerate(results):
+                key = char_width_key(FMT_PRESETS[i])
+                if key in widths:
+                    char_widths[key] = widths[key]
+            chosen = next((i for i, r in enumerate(results) if r[0]), len(results) - 1)
+            fits, rule, attempts = results[chosen][0], results[chosen][1], results[chosen][2]
+
+            # Only the chosen render leaves the scratch dir
+            work = Path(tmp) / f"preset{chosen}"
+            publish(work / "attempt.docx", docx_path)
+            publish(work / "attempt.pdf", pdf_path)
+    finally:
+        save_char_widths(char_widths)
+
+    if fits:
+        if rule is None:
             print(f"OK: 1 page (no trimming). Attempts: {attempts}")
-            return
-
-        # Apply trim rules until 1 page
-        for rule in TRIM_RULES:
-            cur = normalize_whitespace(apply_trim_rule(cur, rule))
-
-            md_to_docx(cur, docx_path, fmt)
-            docx_to_pdf(docx_path, pdf_path)
-            pages = pdf_pages(pdf_path)
-            attempts += 1
-
-            if pages == 1:
-                print(f"OK: 1 page after trimming rule: {rule}. Attempts: {attempts}")
-                return
+        else:
+            print(f"OK: 1 page after trimming rule: {rule}. Attempts: {attempts}")
+        return
 
     print("Could not reach 1 page with current rules.")
     print("Last output was generated anyway; consider trimming one more bullet under IT Support Roles.")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+trim_ops.py
+
+Markdown line handling for build_resume_onepage.py: line classification,
+whitespace cleanup and the trim rules.
+
+Kept free of python-docx/pypdf and fully typed so it can be compiled with
+mypyc for a faster per-line loop (optional; plain Python works the same):
+  pip install mypy
+  mypyc trim_ops.py
+"""
+
+import re
+import bisect
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
+
+
+# ----------------------------
+# Regex helpers
+# ----------------------------
+BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+
+# TRIM_RULES entries, e.g. ("DROP_SECTION", "Title")
+TrimRule = Tuple[Any, ...]
+
+
+def strip_md_bold(s: str) -> str:
+    return BOLD_RE.sub(r"\1", s).strip()
+
+
+def is_hr(line: str) -> bool:
+    """A '---' rule: three or more dashes and only whitespace around them."""
+    s = line.strip()
+    return len(s) >= 3 and not s.strip("-")
+
+
+def line_kind(line: str) -> str:
+    """
+    Classify a Markdown line as hr/h1/h2/h3/bullet/para by prefix tests.
+    """
+    if line[:1] == "#":
+        if line.startswith("# "):
+            return "h1"
+        if line.startswith("## "):
+            return "h2"
+        if line.startswith("### "):
+            return "h3"
+        return "para"
+    if line.startswith("- "):
+        return "bullet"
+    if (line[:1] == "-" or line[:1].isspace()) and is_hr(line):
+        return "hr"
+    return "para"
+
+
+def normalize_whitespace(lines: Iterable[str]) -> Iterator[str]:
+    blank = 0
+    for ln in lines:
+        ln = ln.rstrip()  # also drops forced MD linebreak spaces
+        if not ln:
+            blank += 1
+            if blank <= 1:
+                yield ""
+            continue
+        # Only a line starting with a dash or indent can be a '---' rule
+        if (ln[0] == "-" or ln[0].isspace()) and is_hr(ln):
+            continue
+        blank = 0
+        yield ln
+
+
+# ----------------------------
+# Trim logic
+# ----------------------------
+# One pass builds a structural index of the untrimmed lines. Every trim
+# rule then marks what it drops in a shared keep-mask, looking only at the lines
+# earlier rules left in, so a list of rules composes exactly as applying them one
+# after another, and the kept runs are sliced out once at the end.
+class TrimIndex:
+    """Where the headers and bullets are in a list of lines (see build_index)."""
+
+    def __init__(self, h2_positions: List[int], h3_positions: List[int],
+                 h3_titles: Dict[str, List[int]], bullets_under: Dict[int, List[int]],
+                 n_lines: int) -> None:
+        self.h2_positions = h2_positions
+        self.h3_positions = h3_positions
+        self.h3_titles = h3_titles        # title (bold stripped) -> H3 line numbers
+        self.bullets_under = bullets_under  # H3 line number -> bullet line numbers
+        self.boundaries = sorted(h2_positions + h3_positions)
+        self.n_lines = n_lines
+
+
+def build_index(lines: List[str]) -> TrimIndex:
+    h2_positions: List[int] = []
+    h3_positions: List[int] = []
+    h3_titles: Dict[str, List[int]] = {}
+    bullets_under: Dict[int, List[int]] = {}
+    cur_bullets: Optional[List[int]] = None
+
+    # Hot loop: bind lookups to locals
+    h2_append, h3_append = h2_positions.append, h3_positions.append
+
+    for i, line in enumerate(lines):
+        # Same "## "/"### " prefixes md_to_docx renders as headers
+        if line[:1] == "#":
+            if line.startswith("## "):
+                h2_append(i)
+                continue
+            if line.startswith("### "):
+                title = strip_md_bold(line[4:])
+                h3_append(i)
+                h3_titles.setdefault(title, []).append(i)
+                cur_bullets = bullets_under[i] = []
+                continue
+        # Bullets belong to the last H3 seen, even across an H2 (matches trim semantics)
+        if cur_bullets is not None and line.lstrip().startswith("- "):
+            cur_bullets.append(i)
+
+    return TrimIndex(h2_positions, h3_positions, h3_titles, bullets_under, len(lines))
+
+
+def next_kept(positions: List[int], after: int, keep: List[bool], default: int) -> int:
+    """First position after `after` whose line is still kept, else `default`."""
+    for j in range(bisect.bisect_right(positions, after), len(positions)):
+        if keep[positions[j]]:
+            return positions[j]
+    return default
+
+
+def drop_range(keep: List[bool], start: int, end: int) -> bool:
+    if True not in keep[start:end]:
+        return False
+    keep[start:end] = [False] * (end - start)
+    return True
+
+
+def drop_section(index: TrimIndex, keep: List[bool], section_title: str) -> bool:
+    changed = False
+    for s in index.h3_titles.get(section_title, []):
+        if keep[s]:
+            changed |= drop_range(keep, s, next_kept(index.boundaries, s, keep, index.n_lines))
+    return changed
+
+
+def keep_only_projects(lines: List[str], index: TrimIndex, keep: List[bool], keep_n: int) -> bool:
+    h2s = [i for i in index.h2_positions if keep[i]]
+    h3s = [i for i in index.h3_positions if keep[i]]
+    changed = False
+    project_count = 0
+
+    for j, h2 in enumerate(h2s):
+        if "TECHNICAL PROJECT" not in lines[h2].upper():
+            continue
+        end = h2s[j + 1] if j + 1 < len(h2s) else len(lines)
+        # Count projects in this section; everything from the (keep_n+1)th on goes
+        for h3 in h3s[bisect.bisect_right(h3s, h2):bisect.bisect_left(h3s, end)]:
+            project_count += 1
+            if project_count > keep_n:
+                changed |= drop_range(keep, h3, end)
+                break
+
+    return changed
+
+
+def trim_bullets_under(index: TrimIndex, keep: List[bool], header_title: str, keep_k: int) -> bool:
+    h3s = index.h3_positions
+    bullets_under = index.bullets_under
+    changed = False
+    for h3 in index.h3_titles.get(header_title, []):
+        if not keep[h3]:
+            continue
+        # Bullets of H3s already dropped now belong to this one, as they would
+        # after a re-scan of the trimmed lines
+        kept = 0
+        j = bisect.bisect_left(h3s, h3)
+        while True:
+            for b in bullets_under[h3s[j]]:
+                if keep[b]:
+                    kept += 1
+                    if kept > keep_k:
+                        keep[b] = False
+                        changed = True
+            j += 1
+            if j == len(h3s) or keep[h3s[j]]:
+                break
+    return changed
+
+
+def mark_trim_rule(lines: List[str], rule: TrimRule, index: TrimIndex, keep: List[bool]) -> bool:
+    """Clear `keep` for the lines `rule` drops; True if it dropped any."""
+    kind = rule[0]
+    if kind == "DROP_SECTION":
+        return drop_section(index, keep, rule[1])
+    if kind == "KEEP_ONLY_PROJECTS":
+        return keep_only_projects(lines, index, keep, rule[1])
+    if kind == "TRIM_BULLETS_UNDER":
+        title, keep_k = rule[1]
+        return trim_bullets_under(index, keep, title, keep_k)
+    return False
+
+
+def kept_lines(lines: List[str], keep: List[bool]) -> List[str]:
+    """
+    The lines `keep` marks, copied a run at a time with slices. `lines` is
+    normalize_whitespace output, so only a seam between two runs can put two
+    blank lines next to each other; that's the one place left to clean up.
+    """
+    out: List[str] = []
+    n = len(lines)
+    start = 0
+    while start < n:
+        try:
+            start = keep.index(True, start)
+        except ValueError:
+            break
+        try:
+            end = keep.index(False, start)
+        except ValueError:
+            end = n
+        if out and not out[-1] and not lines[start]:
+            start += 1
+        out.extend(lines[start:end])
+        start = end
+    return out
+
+
+def trim_steps(base_lines: List[str],
+               rules: List[TrimRule]) -> List[Tuple[Optional[TrimRule], List[str]]]:
+    """
+    Lines after each cumulative trim: step 0 is (None, base_lines), step k is
+    (rules[k-1], lines with rules[:k] applied). The index is built once for
+    base_lines; a rule that drops nothing keeps the previous step's list object.
+    """
+    index = build_index(base_lines)
+    keep = [True] * len(base_lines)
+    steps: List[Tuple[Optional[TrimRule], List[str]]] = [(None, base_lines)]
+    cur = base_lines
+    for rule in rules:
+        if mark_trim_rule(base_lines, rule, index, keep):
+            cur = kept_lines(base_lines, keep)
+        steps.append((rule, cur))
+    return steps